@@ -1,10 +1,35 @@
 #!/usr/bin/env python3
 # File name: gha-prtarget-misconfig-audit.py
-# Version: 1.0.3
-# Last updated: 2025-07-11
+# Version: 1.0.28
+# Last updated: 2026-10-14
 # Copyright (C) 2025 sultanovich
 #
 # Changelog:
+#   1.0.28 - 2026-10-14 - Close the log file at exit instead of only flushing the log buffer
+#   1.0.27 - 2026-10-14 - Enable cone-mode sparse checkout with `init --cone` so --poc works on git 2.25+
+#   1.0.26 - 2026-10-14 - Report missing or inaccessible repositories as failures instead of "No workflows"
+#   1.0.25 - 2026-10-14 - Parse workflow files one by one again; batched parsing gave no measurable gain
+#   1.0.24 - 2026-10-14 - Fixed batched parsing attributing documents to the wrong workflow file
+#   1.0.23 - 2026-10-14 - Hoisted detection substrings to module constants; ignore non-string step fields
+#   1.0.22 - 2026-10-14 - Report repositories without workflows and stop scanning them early
+#   1.0.21 - 2026-10-14 - Buffer log file writes and flush them at the end of the scan
+#   1.0.20 - 2026-10-14 - Route console output through the logger so each message is formatted and sanitized once
+#   1.0.19 - 2026-10-14 - Check job steps in a single pass
+#   1.0.18 - 2026-10-14 - Documented running the script under PyPy
+#   1.0.17 - 2026-10-14 - Parse a repo's candidate workflows as one multi-document YAML stream
+#   1.0.16 - 2026-10-14 - Reuse a single temporary directory for all --poc clones
+#   1.0.15 - 2026-10-14 - Disable ANSI colors when stdout is not a terminal
+#   1.0.14 - 2026-10-14 - Read the repository list from a pipe and submit each repo to the scan pool as it is read
+#   1.0.13 - 2026-10-14 - Look up 'on'/'jobs' keys directly before falling back to a key scan
+#   1.0.12 - 2026-10-14 - Skip parsing workflows that do not mention pull_request_target
+#   1.0.11 - 2026-10-14 - Also scan .yaml workflow files; parse raw bytes with the UTF-8 BOM stripped
+#   1.0.10 - 2026-10-14 - Defer debug message formatting until debug output is enabled
+#   1.0.9 - 2026-10-14 - Sanitize messages in a single regex pass
+#   1.0.8 - 2026-10-14 - Precompile sanitization patterns and skip messages that cannot match
+#   1.0.7 - 2026-10-14 - Fetch workflow files through the GitHub contents API; clone only for --poc
+#   1.0.6 - 2026-10-14 - Clone only .github/workflows using a shallow, blobless sparse checkout
+#   1.0.5 - 2026-10-14 - Scan organization repositories in parallel with a thread pool
+#   1.0.4 - 2026-10-14 - Use the LibYAML C loader (CSafeLoader) when available
 #   1.0.3 - 2025-07-12 - Sanitized debug console output to prevent clear-text exposure of sensitive content
 #   1.0.2 - 2025-07-11 - Replaced print-based logging with sanitized logging to file using Python's logging module
 #   1.0.1 - 2025-07-06 - Added inline license header
@@ -35,20 +60,23 @@
 # Usage:
 #   python gha-prtarget-misconfig-audit.py --org <organization>
 #   python gha-prtarget-misconfig-audit.py --repo <owner/repo>
+#   pypy3 gha-prtarget-misconfig-audit.py --org <organization>
 #
 # Options:
 #   --poc     Create a benign PoC file in affected repositories (locally only)
 #   --debug   Enable verbose step-by-step analysis for debugging
 #
 # Requirements:
-#   - Python 3.9 or higher
+#   - Python 3.9 or higher (CPython or PyPy3)
 #   - GitHub CLI authenticated via `gh auth login`
-#   - `git` installed
+#   - `git` 2.25 or higher installed (sparse-checkout, only needed for --poc)
 #   - Python package: PyYAML
 #
 # Notes:
 #   - This tool performs only local, read-only analysis unless --poc is used.
 #   - It is intended for authorized auditing purposes only.
+#   - PyYAML's LibYAML loader is used when available; otherwise (e.g. under
+#     PyPy) the pure-Python SafeLoader is used transparently.
 ###############################################################################
 
 
@@ -61,68 +89,167 @@ import tempfile
 import shutil
 import yaml
 import logging
+from logging.handlers import MemoryHandler
 import re
+import json
+import threading
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-
-CYAN = "\033[0;36m"
-GREEN = "\033[0;32m"
-YELLOW = "\033[1;33m"
-RED = "\033[0;31m"
-RESET = "\033[0m"
-
-# Configure logging - only to file, not console
+from urllib.parse import quote
+
+# Colors are only emitted on a terminal, not when output is redirected
+if sys.stdout.isatty():
+    CYAN = "\033[0;36m"
+    GREEN = "\033[0;32m"
+    YELLOW = "\033[1;33m"
+    RED = "\033[0;31m"
+    RESET = "\033[0m"
+else:
+    CYAN = GREEN = YELLOW = RED = RESET = ""
+
+# Prefer the LibYAML-backed safe loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# Extensions GitHub accepts for workflow files
+WORKFLOW_EXTENSIONS = ('.yml', '.yaml')
+UTF8_BOM = b'\xef\xbb\xbf'
+
+# Substrings searched for in workflow files and job steps
+PR_TARGET_NEEDLE = b'pull_request_target'
+CHECKOUT_NEEDLE = 'actions/checkout'
+SECRETS_NEEDLE = 'secrets.'
+TOKEN_NEEDLE = 'GITHUB_TOKEN'
+FORK_NEEDLE = 'fork'
+
+# Number of log records buffered in memory before they are written to file
+LOG_BUFFER_CAPACITY = 4096
+
+# Maximum number of repositories scanned concurrently in --org mode
+MAX_WORKERS = 16
+
+# Console output is buffered per repository while scanning in parallel and
+# flushed as a single block so lines from different repos do not interleave
+_console_buffer = threading.local()
+_console_lock = threading.Lock()
+
+# Base temporary directory shared by all --poc clones, created on first use
+_workdir = None
+_workdir_lock = threading.Lock()
+
+# Configure logging - handlers for console and file are added in main()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', handlers=[])
 logger = logging.getLogger(__name__)
 
-# Patterns for sanitizing sensitive information
+# Patterns for sanitizing sensitive information (replacements are literal)
 SENSITIVE_PATTERNS = [
     (r'/tmp/tmp[a-zA-Z0-9_]+', '/tmp/[REDACTED]'),
     (r'gh[pousr]_[A-Za-z0-9_]{36}', '[REDACTED_TOKEN]'),
     (r'/home/[^/\s]+', '/home/[USER]'),
-    (r'C:\\\\Users\\\\[^\\\\]+', r'C:\\Users\\[USER]'),
+    (r'C:\\\\Users\\\\[^\\\\]+', 'C:\\Users\\[USER]'),
 ]
+# All patterns fused into one alternation; the matching group name maps back
+# to its replacement so each message is scanned only once
+_SANITIZE_RE = re.compile('|'.join(f'(?P<p{i}>{pattern})' for i, (pattern, _) in enumerate(SENSITIVE_PATTERNS)))
+_REPLACEMENTS = {f'p{i}': replacement for i, (_, replacement) in enumerate(SENSITIVE_PATTERNS)}
 
 def sanitize_message(msg):
     """Sanitize potentially sensitive information from log messages"""
-    for pattern, replacement in SENSITIVE_PATTERNS:
-        msg = re.sub(pattern, replacement, msg)
-    return msg
+    # Every pattern needs a '/', a 'gh' prefix or a backslash to match
+    if '/' not in msg and 'gh' not in msg and '\\' not in msg:
+        return msg
+    return _SANITIZE_RE.sub(lambda m: _REPLACEMENTS[m.lastgroup], msg)
+
+class RecordFilter(logging.Filter):
+    """Sanitize each record once and set the plain and colored labels used by the handlers"""
+    def filter(self, record):
+        record.msg = sanitize_message(record.getMessage())
+        record.args = None
+        label = getattr(record, 'label', None)
+        if label is None:
+            record.plain_label = record.color_label = ''
+        else:
+            record.plain_label = f"[{label}] "
+            record.color_label = f"{record.color}[{label}]{RESET} " if record.color else record.plain_label
+        return True
+
+class ConsoleHandler(logging.Handler):
+    """Write records through console() so they are buffered per repo while scanning"""
+    def emit(self, record):
+        try:
+            console(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+logger.addFilter(RecordFilter())
+
+def setup_console_logging():
+    """Setup console logging; records logged with to_console=False are only written to file"""
+    console_handler = ConsoleHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.addFilter(lambda record: getattr(record, 'to_console', True))
+    console_handler.setFormatter(logging.Formatter('%(color_label)s%(message)s'))
+    logger.addHandler(console_handler)
 
 def setup_file_logging(log_file):
-    """Setup file logging with sanitization"""
+    """Setup buffered file logging with sanitization; returns the buffering handler"""
     file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
     file_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(plain_label)s%(message)s')
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # Batch records instead of writing and flushing the file on every message
+    memory_handler = MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+    memory_handler.setLevel(logging.INFO)
+    logger.addHandler(memory_handler)
+    # atexit runs in reverse order: flush the buffer on close, then close the file
+    atexit.register(file_handler.close)
+    atexit.register(memory_handler.close)
+    return memory_handler
+
+def log(msg, to_console=False):
+    """Log message with sanitization, to file only unless to_console is set"""
+    logger.info(msg, extra={'to_console': to_console})
+
+def console(msg):
+    """Print to stdout, or to the current thread's buffer while a repo is being scanned"""
+    lines = getattr(_console_buffer, 'lines', None)
+    if lines is None:
+        sys.stdout.write(msg + "\n")
+    else:
+        lines.append(msg)
+
+def flush_console():
+    """Print the current thread's buffered output as a single block"""
+    lines = getattr(_console_buffer, 'lines', None)
+    _console_buffer.lines = None
+    if lines:
+        with _console_lock:
+            sys.stdout.write("\n".join(lines) + "\n")
 
-def log(msg):
-    """Log message to file with sanitization - replacement for original log() function"""
-    sanitized_msg = sanitize_message(msg)
-    logger.info(sanitized_msg)
+def _emit(label, color, fmt, *args):
+    """Log a labeled message to the console and the log file; formatting is deferred to the logger"""
+    logger.info(fmt, *args, extra={'label': label, 'color': color})
 
 def info(msg):
-    print(f"{CYAN}[INFO]{RESET} {msg}")
-    log(f"[INFO] {msg}")
+    _emit('INFO', CYAN, msg)
 
 def ok(msg):
-    print(f"{GREEN}[OK]{RESET} {msg}")
-    log(f"[OK] {msg}")
+    _emit('OK', GREEN, msg)
 
 def warn(msg):
-    print(f"{YELLOW}[WARN]{RESET} {msg}")
-    log(f"[WARN] {msg}")
+    _emit('WARN', YELLOW, msg)
 
 def fail(msg):
-    print(f"{RED}[FAIL]{RESET} {msg}")
-    log(f"[FAIL] {msg}")
+    _emit('FAIL', RED, msg)
 
-def debug(msg, enabled):
+def debug(enabled, fmt, *args):
+    """Print and log a debug message; formatting is skipped unless debug is enabled"""
     if enabled:
-        sanitized_msg = sanitize_message(msg)
-        print(f"{YELLOW}[DEBUG]{RESET} {sanitized_msg}")
-        log(f"[DEBUG] {sanitized_msg}")
+        _emit('DEBUG', YELLOW, fmt, *args)
 
 
 def parse_args():
@@ -142,78 +269,131 @@ def check_gh_auth():
         sys.exit(1)
 
 def clone_repo(repo, workdir, debug_enabled):
-    debug(f"Cloning {repo} into {workdir}", debug_enabled)
+    debug(debug_enabled, "Cloning %s into %s", repo, workdir)
     try:
-        subprocess.run(['gh', 'repo', 'clone', repo, workdir], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Shallow, blobless clone without checkout, then materialize only the
+        # workflows directory. gh handles the protocol (ssh/https) and auth.
+        subprocess.run(['gh', 'repo', 'clone', repo, workdir, '--',
+                        '--filter=blob:none', '--no-checkout', '--depth=1'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # 'set --cone' needs git 2.35+; 'init --cone' followed by 'set' works on 2.25+
+        subprocess.run(['git', '-C', workdir, 'sparse-checkout', 'init', '--cone'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(['git', '-C', workdir, 'sparse-checkout', 'set', '.github/workflows'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(['git', '-C', workdir, 'checkout', 'HEAD'],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except subprocess.CalledProcessError as e:
         # Don't expose detailed error information
         sanitized_repo = repo.replace('/', '_')
         fail(f"Failed to clone repository {sanitized_repo}")
         raise
 
-def analyze_workflows(repo_path, debug_enabled):
-    gha_dir = Path(repo_path) / '.github' / 'workflows'
+def repo_exists(repo):
+    """Return True if the repo exists and is visible to the authenticated user"""
+    result = subprocess.run(['gh', 'api', f'/repos/{repo}'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+def fetch_workflows(repo, debug_enabled):
+    """Download a repo's workflow files via the contents API as (name, raw bytes) tuples"""
+    debug(debug_enabled, "Listing workflows of %s", repo)
+    listing = subprocess.run(['gh', 'api', f'/repos/{repo}/contents/.github/workflows'],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if listing.returncode != 0:
+        # The API also answers 404 for repos that do not exist or that the
+        # token cannot see, so confirm the repo itself is reachable first
+        if 'HTTP 404' in listing.stderr and repo_exists(repo):
+            debug(debug_enabled, "No .github/workflows directory found.")
+            return []
+        # Don't expose detailed error information
+        sanitized_repo = repo.replace('/', '_')
+        fail(f"Failed to list workflows of repository {sanitized_repo}")
+        raise subprocess.CalledProcessError(listing.returncode, listing.args)
+
+    workflows = []
+    for entry in json.loads(listing.stdout):
+        if entry.get('type') != 'file' or not entry['name'].endswith(WORKFLOW_EXTENSIONS):
+            continue
+        debug(debug_enabled, "Downloading file: %s", entry['name'])
+        content = subprocess.run(['gh', 'api', '-H', 'Accept: application/vnd.github.raw',
+                                  f"/repos/{repo}/contents/{quote(entry['path'])}"],
+                                 check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        workflows.append((entry['name'], content.stdout))
+    return workflows
+
+def find_key(doc, name, *aliases):
+    """Return the key of doc matching name, trying exact keys before a case-insensitive scan"""
+    for key in (name,) + aliases:
+        if key in doc:
+            return key
+    for k in doc.keys():
+        if str(k).strip('"').strip("'").lower() == name:
+            return k
+    return None
+
+def analyze_workflows(workflows, debug_enabled):
     results = {'vuln': [], 'risk': [], 'safe': True}
 
-    if not gha_dir.exists():
-        debug("No .github/workflows directory found.", debug_enabled)
-        return results
-
-    for file in gha_dir.glob('*.yml'):
-        debug(f"Parsing file: {file.name}", debug_enabled)
-        with open(file, 'r', encoding='utf-8-sig') as f:
-            try:
-                doc = yaml.safe_load(f)
-            except yaml.YAMLError:
-                debug(f"Failed to parse {file.name}", debug_enabled)
-                continue
+    for name, raw in workflows:
+        # A plain substring check is far cheaper than a YAML parse and rules
+        # out most workflows, which never use the trigger at all
+        if PR_TARGET_NEEDLE not in raw:
+            debug(debug_enabled, "Skipping %s because it does not mention pull_request_target", name)
+            continue
+
+        debug(debug_enabled, "Parsing file: %s", name)
+        if raw.startswith(UTF8_BOM):
+            raw = raw[len(UTF8_BOM):]
+        try:
+            doc = yaml.load(raw, Loader=_Loader)
+        except yaml.YAMLError:
+            debug(debug_enabled, "Failed to parse %s", name)
+            continue
 
         if not isinstance(doc, dict):
-            debug(f"Skipping {file.name} because it's not a dictionary", debug_enabled)
+            debug(debug_enabled, "Skipping %s because it's not a dictionary", name)
             continue
 
         # PyYAML puede interpretar "on" como booleano True (YAML 1.1 quirk),
         # por eso lo buscamos explícitamente también como True.
-        real_on_key = None
-        for k in doc.keys():
-            if str(k).strip('"').strip("'").lower() == 'on' or k is True:
-                real_on_key = k
-                break
+        real_on_key = find_key(doc, 'on', True)
 
         if real_on_key is None:
-            debug(f"Skipping {file.name} due to missing 'on' key", debug_enabled)
+            debug(debug_enabled, "Skipping %s due to missing 'on' key", name)
             continue
 
         triggers = doc[real_on_key]
         has_pr_target = isinstance(triggers, dict) and 'pull_request_target' in triggers
-        debug(f"pull_request_target present: {has_pr_target}", debug_enabled)
+        debug(debug_enabled, "pull_request_target present: %s", has_pr_target)
 
         if has_pr_target:
-            real_jobs_key = None
-            for k in doc.keys():
-                if str(k).strip('"').strip("'").lower() == 'jobs':
-                    real_jobs_key = k
-                    break
+            real_jobs_key = find_key(doc, 'jobs')
             if real_jobs_key is None:
-                debug(f"No 'jobs' key found in {file.name}", debug_enabled)
+                debug(debug_enabled, "No 'jobs' key found in %s", name)
                 continue
 
             jobs = doc[real_jobs_key]
             for job_name, job in jobs.items():
                 steps = job.get('steps', [])
-                debug(f"Analyzing job: {job_name} with {len(steps)} steps", debug_enabled)
-
-                has_checkout = any('uses' in step and 'actions/checkout' in step['uses'] for step in steps)
-                debug(f"  - uses checkout: {has_checkout}", debug_enabled)
-
-                uses_secrets = any('run' in step and ('secrets.' in step['run'] or 'GITHUB_TOKEN' in step['run']) for step in steps)
-                debug(f"  - uses secrets or token: {uses_secrets}", debug_enabled)
-
-                has_if_fork = any('if' in step and 'fork' in step['if'] for step in steps)
-                debug(f"  - has if condition for fork: {has_if_fork}", debug_enabled)
+                debug(debug_enabled, "Analyzing job: %s with %d steps", job_name, len(steps))
+
+                has_checkout = uses_secrets = has_if_fork = False
+                for step in steps:
+                    uses = step.get('uses')
+                    if isinstance(uses, str) and CHECKOUT_NEEDLE in uses:
+                        has_checkout = True
+                    run = step.get('run')
+                    if isinstance(run, str) and (SECRETS_NEEDLE in run or TOKEN_NEEDLE in run):
+                        uses_secrets = True
+                    condition = step.get('if')
+                    if isinstance(condition, str) and FORK_NEEDLE in condition:
+                        has_if_fork = True
+                debug(debug_enabled, "  - uses checkout: %s", has_checkout)
+                debug(debug_enabled, "  - uses secrets or token: %s", uses_secrets)
+                debug(debug_enabled, "  - has if condition for fork: %s", has_if_fork)
 
                 has_permissions = 'permissions' in job
-                debug(f"  - has permissions defined: {has_permissions}", debug_enabled)
+                debug(debug_enabled, "  - has permissions defined: %s", has_permissions)
 
                 findings = []
                 if has_checkout or uses_secrets or not has_if_fork or not has_permissions:
@@ -221,38 +401,57 @@ def analyze_workflows(repo_path, debug_enabled):
                     if uses_secrets: findings.append("secrets or GITHUB_TOKEN usage found")
                     if not has_if_fork: findings.append("no fork condition (if: ...fork == false)")
                     if not has_permissions: findings.append("permissions not set")
-                    results['vuln'].append((file.name, job_name, findings))
+                    results['vuln'].append((name, job_name, findings))
                     results['safe'] = False
                 else:
-                    results['risk'].append(file.name)
+                    results['risk'].append(name)
                     results['safe'] = False
 
     return results
 
+def get_workdir():
+    """Return the shared temporary base directory, creating it on first use"""
+    global _workdir
+    with _workdir_lock:
+        if _workdir is None:
+            _workdir = tempfile.mkdtemp()
+            atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+    return _workdir
+
+def create_poc(repo, debug_enabled):
+    """Clone the repo into a temporary directory and drop a benign PoC file in it"""
+    workdir = os.path.join(get_workdir(), repo.replace('/', '__'))
+    try:
+        clone_repo(repo, workdir, debug_enabled)
+        poc_file = Path(workdir) / 'POC_PR_TARGET_MISCONFIG.txt'
+        poc_file.write_text("This is a benign PoC file for pull_request_target misconfig.")
+        ok(f"PoC file created in {repo}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
 def scan_repo(repo, poc, debug_enabled):
+    _console_buffer.lines = []
     info(f"Scanning {repo} ...")
-    workdir = tempfile.mkdtemp()
     try:
-        clone_repo(repo, workdir, debug_enabled)
-        results = analyze_workflows(workdir, debug_enabled)
+        workflows = fetch_workflows(repo, debug_enabled)
+        if not workflows:
+            ok(f"No workflows in {repo}")
+            return
+        results = analyze_workflows(workflows, debug_enabled)
 
         if results['vuln']:
             warn(f"VULNERABLE: {repo}")
             for wf, job, issues in results['vuln']:
                 for issue in issues:
                     msg = f"  - {wf}:{job}: {issue}"
-                    print(msg)
-                    log(msg)
+                    log(msg, to_console=True)
             if poc:
-                poc_file = Path(workdir) / 'POC_PR_TARGET_MISCONFIG.txt'
-                poc_file.write_text("This is a benign PoC file for pull_request_target misconfig.")
-                ok(f"PoC file created in {repo}")
+                create_poc(repo, debug_enabled)
         elif results['risk']:
             warn(f"RISK (manual review): {repo}")
             for wf in results['risk']:
                 msg = f"  - {wf}"
-                print(msg)
-                log(msg)
+                log(msg, to_console=True)
         else:
             ok(f"No risky pull_request_target usage detected in {repo}")
 
@@ -260,12 +459,12 @@ def scan_repo(repo, poc, debug_enabled):
         # Sanitize error messages - only log exception type, not details
         sanitized_repo = repo.replace('/', '_')
         fail(f"Error scanning {sanitized_repo}: {type(e).__name__}")
-        if debug_enabled:
-            debug(f"Exception details: {sanitize_message(str(e))}", debug_enabled)
+        debug(debug_enabled, "Exception details: %s", e)
     finally:
-        shutil.rmtree(workdir)
+        flush_console()
 
 def main():
+    setup_console_logging()
     args = parse_args()
     check_gh_auth()
 
@@ -275,22 +474,33 @@ def main():
     Path("output").mkdir(exist_ok=True)
     
     # Setup file logging
-    setup_file_logging(log_file)
+    log_buffer = setup_file_logging(log_file)
     log(f"Scan started at {timestamp}")
 
     if args.repo:
         scan_repo(args.repo, args.poc, args.debug)
     else:
-        result = subprocess.run([
+        # The repo list is read from a pipe and each repo is submitted to the
+        # pool as it is read; gh subprocesses release the GIL, so threads are
+        # enough here. Leaving the Popen block closes the pipe and waits for gh.
+        futures = []
+        with subprocess.Popen([
             'gh', 'repo', 'list', args.org, '--limit', '1000', '--json', 'nameWithOwner', '-q', '.[].nameWithOwner'
-        ], stdout=subprocess.PIPE, check=True, text=True)
-        repos = result.stdout.strip().splitlines()
-        info(f"Total repositories to scan: {len(repos)}")
-        for repo in repos:
-            scan_repo(repo, args.poc, args.debug)
+        ], stdout=subprocess.PIPE, text=True) as proc:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                for line in proc.stdout:
+                    repo = line.strip()
+                    if repo:
+                        futures.append(executor.submit(scan_repo, repo, args.poc, args.debug))
+                for future in futures:
+                    future.result()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        info(f"Total repositories scanned: {len(futures)}")
 
     log("Scan completed.")
     ok(f"Log saved to: {log_file}")
+    log_buffer.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file